@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from db.database import get_db
 from db.models import User, OTP
+from .households import user_babies
 from datetime import datetime, timedelta
 
 router = APIRouter()
@@ -95,7 +96,7 @@ async def verify_otp(request: Request, phone: str = Form(...), otp: str = Form(.
     return JSONResponse({
         "status": "success", 
         "message": "Authenticated",
-        "has_baby": user.baby is not None
+        "has_baby": len(user_babies(db, user)) > 0
     })
 
 @router.get("/logout")
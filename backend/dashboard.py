@@ -0,0 +1,118 @@
+import os
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Callable, List
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from db.models import Baby, Household, SleepEvent, CryEvent, Task, NightRecording
+from .responses import ORJSONResponse
+from .schemas import DashboardOut, BabyOut, CryOut, TaskOut, NightRecordingOut
+
+# Rendered dashboards are shared by every caregiver of a household and reused
+# until the household version changes or the entry expires (sleep totals tick)
+DASHBOARD_CACHE_SECONDS = int(os.getenv("DASHBOARD_CACHE_SECONDS", "15"))
+DASHBOARD_CACHE_SIZE = 1024
+_cache = OrderedDict()
+
+def _columns(model, schema) -> list:
+    # Select only what the response schema needs; hydrating ORM objects and
+    # reading instrumented attributes costs more than the query itself
+    return [model.baby_id] + [getattr(model, name) for name in schema.model_fields]
+
+def _grouped(db: Session, stmt) -> dict:
+    # Plain tuples zipped with the column names are several times cheaper than
+    # ORM Query rows and Row._asdict(); baby_id is always the first column
+    result = db.execute(stmt)
+    keys = list(result.keys())
+    grouped = defaultdict(list)
+    for row in result:
+        grouped[row[0]].append(dict(zip(keys, row)))
+    return grouped
+
+def _latest_per_baby(db: Session, model, schema, baby_ids: List[int], limit: int):
+    rank = func.row_number().over(partition_by=model.baby_id, order_by=model.timestamp.desc()).label("rank")
+    ranked = select(model.id.label("id"), rank).where(model.baby_id.in_(baby_ids)).subquery()
+    return _grouped(db, select(*_columns(model, schema)).join(ranked, model.id == ranked.c.id).where(ranked.c.rank <= limit).order_by(model.timestamp.desc()))
+
+def _format_duration(total_seconds: float) -> str:
+    hours = int(total_seconds // 3600)
+    minutes = int((total_seconds % 3600) // 60)
+    return f"{hours}h {minutes}m"
+
+def get_dashboard_data(db: Session, babies: List[Baby]) -> List[DashboardOut]:
+    """
+    Builds dashboards for any number of babies with a fixed number of batched
+    queries (one per section), so a household view costs the same round trips
+    as a single baby.
+    """
+    if not babies:
+        return []
+    baby_ids = [b.id for b in babies]
+    now = datetime.now()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # Get baby status
+    ongoing_sleeps = {}
+    for baby_id, sleep_id in db.query(SleepEvent.baby_id, SleepEvent.id).filter(SleepEvent.baby_id.in_(baby_ids), SleepEvent.end_time == None).order_by(SleepEvent.id):
+        ongoing_sleeps.setdefault(baby_id, sleep_id)
+    recent_cries = _latest_per_baby(db, CryEvent, CryOut, baby_ids, 5)
+
+    # Stats
+    cry_counts = dict(db.query(CryEvent.baby_id, func.count(CryEvent.id)).filter(CryEvent.baby_id.in_(baby_ids), CryEvent.timestamp >= today_start).group_by(CryEvent.baby_id).all())
+
+    # Sleep Stats
+    sleep_counts = defaultdict(int)
+    sleep_seconds = defaultdict(float)
+    sleeps_today = db.query(SleepEvent.baby_id, SleepEvent.start_time, SleepEvent.end_time, SleepEvent.is_sleeping).filter(SleepEvent.baby_id.in_(baby_ids), SleepEvent.start_time >= today_start)
+    for baby_id, start_time, end_time, is_sleeping in sleeps_today:
+        sleep_counts[baby_id] += 1
+        if end_time:
+            sleep_seconds[baby_id] += (end_time - start_time).total_seconds()
+        elif is_sleeping:
+            sleep_seconds[baby_id] += (now - start_time).total_seconds()
+
+    # Tasks
+    tasks = _grouped(db, select(*_columns(Task, TaskOut)).where(Task.baby_id.in_(baby_ids)).order_by(Task.id))
+
+    night_recordings = _latest_per_baby(db, NightRecording, NightRecordingOut, baby_ids, 10)
+
+    # One validation call per baby over plain dicts (nested rows included)
+    return [DashboardOut.model_validate({
+        "baby": BabyOut.model_validate(baby),
+        "ongoing_sleep": ongoing_sleeps.get(baby.id),
+        "recent_cries": recent_cries[baby.id],
+        "cry_count_today": cry_counts.get(baby.id, 0),
+        "sleep_count_today": sleep_counts[baby.id],
+        "sleep_duration_today": _format_duration(sleep_seconds[baby.id]),
+        "tasks": tasks[baby.id],
+        "night_recordings": night_recordings[baby.id]
+    }) for baby in babies]
+
+def cached_response(request: Request, household: Household, key: tuple, build: Callable[[], ORJSONResponse]) -> Response:
+    """
+    Serves a rendered response from the shared cache while `household.version`
+    is unchanged. The key must not include the caller, so all caregivers of a
+    household hit the same entry. Sends an ETag and honours If-None-Match.
+    """
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry and entry[0] == household.version and entry[1] > now:
+        body = entry[2]
+    else:
+        body = build().body
+        _cache[key] = (household.version, now + DASHBOARD_CACHE_SECONDS, body)
+        _cache.move_to_end(key)
+        while len(_cache) > DASHBOARD_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    etag = f'W/"{household.id}-{household.version}-{zlib.crc32(body):08x}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Request, Depends
+from sqlalchemy.orm import Session
+
+from db.database import get_db
+from db.models import User, Baby, BabyEvent, GrowthPoint, TaskHistory
+from .households import current_user, get_baby, touch_household
+from .projections import apply_projections
+from .responses import model_response
+from .schemas import EventOut, EventLogOut, GrowthPointOut, GrowthOut, TaskHistoryOut, TaskHistoryLogOut
+
+router = APIRouter()
+
+def record_event(db: Session, user: Optional[User], baby: Baby, event_type: str, payload: dict) -> BabyEvent:
+    """
+    Appends a baby event and applies it to every projection in the caller's
+    transaction. All baby writes go through here: rows created by an endpoint
+    must already be flushed so their ids can be carried in the payload.
+    """
+    event = BabyEvent(
+        baby_id=baby.id,
+        household_id=baby.household_id,
+        user_id=user.id if user else None,
+        event_type=event_type,
+        payload={k: v.isoformat() if isinstance(v, datetime) else v for k, v in payload.items()},
+        created_at=datetime.now()
+    )
+    db.add(event)
+    db.flush()
+    apply_projections(db, [event])
+    touch_household(db, baby.household_id)
+    return event
+
+# Audit & Projection Endpoints
+@router.get("/babies/{baby_id}/events")
+async def baby_events(baby_id: int, request: Request, limit: int = 50, before_id: Optional[int] = None, db: Session = Depends(get_db)):
+    baby = get_baby(db, current_user(request, db), baby_id)
+    query = db.query(BabyEvent).filter(BabyEvent.baby_id == baby.id)
+    if before_id is not None:
+        query = query.filter(BabyEvent.id < before_id)
+    events = query.order_by(BabyEvent.id.desc()).limit(min(max(limit, 1), 500)).all()
+    return model_response(EventLogOut(events=[EventOut(
+        id=e.id,
+        event_type=e.event_type,
+        payload=e.payload,
+        user_id=e.user_id,
+        phone_number=e.user.phone_number if e.user else None,
+        created_at=e.created_at
+    ) for e in events]))
+
+@router.get("/babies/{baby_id}/growth")
+async def baby_growth(baby_id: int, request: Request, db: Session = Depends(get_db)):
+    baby = get_baby(db, current_user(request, db), baby_id)
+    points = db.query(GrowthPoint).filter(GrowthPoint.baby_id == baby.id).order_by(GrowthPoint.measured_at, GrowthPoint.id).all()
+    return model_response(GrowthOut(points=[GrowthPointOut.model_validate(p) for p in points]))
+
+@router.get("/babies/{baby_id}/task-history")
+async def baby_task_history(baby_id: int, request: Request, task_id: Optional[int] = None, db: Session = Depends(get_db)):
+    baby = get_baby(db, current_user(request, db), baby_id)
+    query = db.query(TaskHistory).filter(TaskHistory.baby_id == baby.id)
+    if task_id is not None:
+        query = query.filter(TaskHistory.task_id == task_id)
+    rows = query.order_by(TaskHistory.event_id.desc()).all()
+    return model_response(TaskHistoryLogOut(history=[TaskHistoryOut.model_validate(r) for r in rows]))
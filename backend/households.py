@@ -0,0 +1,175 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Request, Form, Depends, HTTPException
+from sqlalchemy.orm import Session, selectinload
+
+from db.database import get_db
+from db.models import User, Baby, Household, HouseholdMember
+from .dashboard import get_dashboard_data, cached_response
+from .responses import ORJSONResponse, model_response
+from .schemas import HouseholdDashboardOut, parse_fields
+
+router = APIRouter()
+
+# Roles, lowest to highest. Viewers read, caregivers log, owners manage.
+ROLE_LEVELS = {"viewer": 0, "caregiver": 1, "owner": 2}
+
+# Access Helpers
+def current_user(request: Request, db: Session) -> User:
+    user_id = request.session.get("user_id")
+    user = db.query(User).filter(User.id == user_id).first() if user_id else None
+    if not user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return user
+
+def _check_role(role: str, required: str):
+    if ROLE_LEVELS.get(role, -1) < ROLE_LEVELS[required]:
+        raise HTTPException(status_code=403, detail="Insufficient household role")
+
+def get_baby(db: Session, user: User, baby_id: Optional[int] = None, role: str = "viewer") -> Baby:
+    """
+    Resolves the baby selected by `baby_id` among the user's households and
+    checks the user's role there. Without `baby_id` the user's first baby is
+    used, so single-baby clients keep working unchanged.
+    """
+    query = db.query(Baby, HouseholdMember.role).join(HouseholdMember, HouseholdMember.household_id == Baby.household_id).filter(HouseholdMember.user_id == user.id)
+    if baby_id is not None:
+        row = query.filter(Baby.id == baby_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Baby not found")
+    else:
+        row = query.order_by(Baby.id).first()
+        if not row:
+            raise HTTPException(status_code=401, detail="Unauthorized")
+    _check_role(row.role, role)
+    return row.Baby
+
+def get_household(db: Session, user: User, household_id: int, role: str = "viewer") -> Household:
+    row = db.query(Household, HouseholdMember.role).join(HouseholdMember, HouseholdMember.household_id == Household.id).filter(
+        Household.id == household_id,
+        HouseholdMember.user_id == user.id
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Household not found")
+    _check_role(row.role, role)
+    return row.Household
+
+def user_babies(db: Session, user: User, role: str = "viewer") -> List[Baby]:
+    """Babies in every household where the user holds at least `role`."""
+    roles = [r for r, level in ROLE_LEVELS.items() if level >= ROLE_LEVELS[role]]
+    return db.query(Baby).join(HouseholdMember, HouseholdMember.household_id == Baby.household_id).filter(
+        HouseholdMember.user_id == user.id,
+        HouseholdMember.role.in_(roles)
+    ).order_by(Baby.id).all()
+
+def ensure_household(db: Session, user: User) -> Household:
+    """Returns the first household the user owns, creating one on first registration."""
+    household = db.query(Household).join(HouseholdMember).filter(HouseholdMember.user_id == user.id, HouseholdMember.role == "owner").order_by(Household.id).first()
+    if not household:
+        household = Household(name="My Family", version=0)
+        db.add(household)
+        db.flush()
+        db.add(HouseholdMember(household_id=household.id, user_id=user.id, role="owner"))
+    return household
+
+def _keep_an_owner(db: Session, member: HouseholdMember):
+    # Raised before an owner is removed or demoted
+    if member.role != "owner":
+        return
+    owners = db.query(HouseholdMember).filter(HouseholdMember.household_id == member.household_id, HouseholdMember.role == "owner").count()
+    if owners <= 1:
+        raise HTTPException(status_code=400, detail="A household needs at least one owner")
+
+def touch_household(db: Session, household_id: int):
+    """Bumps the household version so shared cached reads are rebuilt."""
+    db.query(Household).filter(Household.id == household_id).update({Household.version: Household.version + 1}, synchronize_session=False)
+
+# Household Endpoints
+@router.get("/households")
+async def list_households(request: Request, db: Session = Depends(get_db)):
+    user = current_user(request, db)
+    # Babies, members and their users load in one query each, not per household
+    memberships = db.query(HouseholdMember).filter(HouseholdMember.user_id == user.id).options(
+        selectinload(HouseholdMember.household).selectinload(Household.babies),
+        selectinload(HouseholdMember.household).selectinload(Household.members).selectinload(HouseholdMember.user)
+    ).order_by(HouseholdMember.household_id).all()
+    return ORJSONResponse({
+        "households": [{
+            "id": m.household.id,
+            "name": m.household.name,
+            "role": m.role,
+            "babies": [{"id": b.id, "name": b.name} for b in m.household.babies],
+            "members": [{"user_id": mm.user_id, "phone_number": mm.user.phone_number, "role": mm.role} for mm in m.household.members]
+        } for m in memberships]
+    })
+
+@router.post("/households")
+async def create_household(request: Request, name: str = Form(...), db: Session = Depends(get_db)):
+    user = current_user(request, db)
+    household = Household(name=name, version=0)
+    db.add(household)
+    db.flush()
+    db.add(HouseholdMember(household_id=household.id, user_id=user.id, role="owner"))
+    db.commit()
+    return ORJSONResponse({"status": "success", "household_id": household.id})
+
+@router.post("/households/{household_id}/members")
+async def add_member(
+    household_id: int,
+    request: Request,
+    phone: str = Form(...),
+    role: str = Form("caregiver"),
+    db: Session = Depends(get_db)
+):
+    user = current_user(request, db)
+    get_household(db, user, household_id, role="owner")
+    if role not in ROLE_LEVELS:
+        raise HTTPException(status_code=400, detail="Invalid role")
+
+    # Caregivers may not have logged in yet; their account is created on invite
+    invitee = db.query(User).filter(User.phone_number == phone).first()
+    if not invitee:
+        invitee = User(phone_number=phone)
+        db.add(invitee)
+        db.flush()
+
+    member = db.query(HouseholdMember).filter(HouseholdMember.household_id == household_id, HouseholdMember.user_id == invitee.id).first()
+    if member:
+        if role != "owner":
+            _keep_an_owner(db, member)
+        member.role = role
+    else:
+        db.add(HouseholdMember(household_id=household_id, user_id=invitee.id, role=role))
+    db.commit()
+    return ORJSONResponse({"status": "success", "user_id": invitee.id, "role": role})
+
+@router.delete("/households/{household_id}/members/{member_user_id}")
+async def remove_member(household_id: int, member_user_id: int, request: Request, db: Session = Depends(get_db)):
+    user = current_user(request, db)
+    get_household(db, user, household_id, role="owner")
+
+    member = db.query(HouseholdMember).filter(HouseholdMember.household_id == household_id, HouseholdMember.user_id == member_user_id).first()
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+    _keep_an_owner(db, member)
+    db.delete(member)
+    db.commit()
+    return ORJSONResponse({"status": "success"})
+
+@router.get("/households/{household_id}/dashboard")
+async def household_dashboard(household_id: int, request: Request, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    user = current_user(request, db)
+    household = get_household(db, user, household_id)
+
+    # Sparse fieldsets apply per baby: ?fields=babies.baby.name,babies.tasks.title
+    include = parse_fields(HouseholdDashboardOut, fields)
+
+    def build():
+        babies = sorted(household.babies, key=lambda b: b.id)
+        return model_response(HouseholdDashboardOut(
+            id=household.id,
+            name=household.name,
+            babies=get_dashboard_data(db, babies)
+        ), include)
+
+    return cached_response(request, household, ("household", household.id, fields), build)
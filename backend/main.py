@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Request, Form, Depends, File, UploadFile, HTTPException, status
-from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from sqlalchemy.orm import Session
 from starlette.middleware.sessions import SessionMiddleware
 from datetime import datetime, timedelta
@@ -11,14 +11,20 @@ import random
 from typing import Optional
 
 from db.database import engine, get_db, Base
-from db.models import User, Baby, SleepEvent, CryEvent, Task, NightRecording, OTP
+from db.models import User, Baby, SleepEvent, CryEvent, Task, OTP
 from .auth import router as auth_router
+from .dashboard import get_dashboard_data, cached_response
+from .events import router as events_router, record_event
+from .households import router as households_router, current_user, get_baby, get_household, user_babies, ensure_household
+from .night_recording import router as night_recording_router
+from .responses import ORJSONResponse, model_response
+from .schemas import DashboardOut, AnalysisOut, SleepDayOut, parse_fields
 
 # Create Tables
 Base.metadata.create_all(bind=engine)
 
 # App Setup
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS Middleware
 app.add_middleware(
@@ -34,11 +40,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses above the threshold (dashboard polls with many tasks)
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MIN_SIZE", "1000")))
+
 # Session Middleware
 app.add_middleware(SessionMiddleware, secret_key="super-secret-random-key")
 
-# Include Auth Router
+# Include Routers
 app.include_router(auth_router, prefix="/api")
+app.include_router(households_router, prefix="/api")
+app.include_router(events_router, prefix="/api")
+app.include_router(night_recording_router, prefix="/api")
 
 @app.get("/api")
 async def root_api():
@@ -49,82 +61,18 @@ if not os.path.exists("uploads"):
     os.makedirs("uploads")
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
-# Utility Functions
-async def get_dashboard_data(db: Session, user: User):
-    baby = user.baby
-    if not baby:
-        return {"baby": None}
-        
-    # Get baby status
-    ongoing_sleep = db.query(SleepEvent).filter(SleepEvent.baby_id == baby.id, SleepEvent.end_time == None).first()
-    recent_cries = db.query(CryEvent).filter(CryEvent.baby_id == baby.id).order_by(CryEvent.timestamp.desc()).limit(5).all()
-    
-    # Stats
-    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    cry_count_today = db.query(CryEvent).filter(CryEvent.baby_id == baby.id, CryEvent.timestamp >= today_start).count()
-    
-    # Sleep Stats
-    sleeps_today = db.query(SleepEvent).filter(SleepEvent.baby_id == baby.id, SleepEvent.start_time >= today_start).all()
-    sleep_count_today = len(sleeps_today)
-    
-    total_sleep_seconds = 0
-    for s in sleeps_today:
-        if s.end_time:
-            total_sleep_seconds += (s.end_time - s.start_time).total_seconds()
-        elif s.is_sleeping:
-            total_sleep_seconds += (datetime.now() - s.start_time).total_seconds()
-            
-    # Format Duration
-    hours = int(total_sleep_seconds // 3600)
-    minutes = int((total_sleep_seconds % 3600) // 60)
-    sleep_duration_today = f"{hours}h {minutes}m"
-
-    # Tasks
-    tasks = db.query(Task).filter(Task.baby_id == baby.id).all()
-    
-    night_recordings = db.query(NightRecording).filter(NightRecording.baby_id == baby.id).order_by(NightRecording.timestamp.desc()).limit(10).all()
-
-    return {
-        "baby": {
-            "id": baby.id,
-            "name": baby.name,
-            "gender": baby.gender,
-            "birth_date": baby.birth_date,
-            "weight": baby.weight,
-            "photo_url": baby.photo_url
-        },
-        "ongoing_sleep": ongoing_sleep.id if ongoing_sleep else None,
-        "recent_cries": [{"id": c.id, "intensity": c.intensity, "timestamp": c.timestamp.isoformat(), "audio_url": c.audio_url} for c in recent_cries],
-        "cry_count_today": cry_count_today,
-        "sleep_count_today": sleep_count_today,
-        "sleep_duration_today": sleep_duration_today,
-        "tasks": [{
-            "id": t.id, 
-            "title": t.title, 
-            "is_completed": t.is_completed, 
-            "due_time": t.due_time, 
-            "category": t.category,
-            "action_type": t.action_type,
-            "interval_minutes": t.interval_minutes,
-            "interval_count": t.interval_count,
-            "photo_url": t.photo_url
-        } for t in tasks],
-        "night_recordings": [{"id": n.id, "timestamp": n.timestamp.isoformat(), "audio_url": n.audio_url, "duration": n.duration} for n in night_recordings]
-    }
-
 @app.get("/api/dashboard")
-async def dashboard(request: Request, db: Session = Depends(get_db)):
-    user_id = request.session.get("user_id")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    if not user.baby:
-        return JSONResponse({"status": "no_baby"})
-        
-    data = await get_dashboard_data(db, user)
-    return JSONResponse(data)
+async def dashboard(request: Request, baby_id: Optional[int] = None, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    user = current_user(request, db)
+    babies = user_babies(db, user)
+    if not babies:
+        return ORJSONResponse({"status": "no_baby"})
+    baby = get_baby(db, user, baby_id) if baby_id is not None else babies[0]
+
+    # Sparse fieldsets: ?fields=baby.name,tasks.title,tasks.is_completed
+    include = parse_fields(DashboardOut, fields)
+    build = lambda: model_response(get_dashboard_data(db, [baby])[0], include)
+    return cached_response(request, baby.household, ("baby", baby.id, fields), build)
 
 @app.post("/api/task/create")
 async def create_task(
@@ -135,12 +83,11 @@ async def create_task(
     interval_minutes: int = Form(0),
     interval_count: int = Form(1),
     photo: Optional[UploadFile] = File(None),
+    baby_id: Optional[int] = Form(None),
     db: Session = Depends(get_db)
 ):
-    user_id = request.session.get("user_id")
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.baby:
-        raise HTTPException(status_code=401, detail="Unauthorized")
+    user = current_user(request, db)
+    baby = get_baby(db, user, baby_id, role="caregiver")
 
     photo_url = None
     if photo and photo.filename:
@@ -153,7 +100,7 @@ async def create_task(
         photo_url = f"/uploads/tasks/{filename}"
 
     new_task = Task(
-        baby_id=user.baby.id,
+        baby_id=baby.id,
         title=title,
         action_type=action_type,
         due_time=due_time,
@@ -162,17 +109,23 @@ async def create_task(
         photo_url=photo_url
     )
     db.add(new_task)
+    db.flush()
+    record_event(db, user, baby, "task_created", {
+        "task_id": new_task.id,
+        "title": title,
+        "action_type": action_type,
+        "due_time": due_time,
+        "interval_minutes": interval_minutes,
+        "interval_count": interval_count,
+        "photo_url": photo_url
+    })
     db.commit()
-    return JSONResponse({"status": "success", "task_id": new_task.id})
+    return ORJSONResponse({"status": "success", "task_id": new_task.id})
 
 @app.get("/api/analysis")
-async def analysis(request: Request, db: Session = Depends(get_db)):
-    user_id = request.session.get("user_id")
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.baby:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
-    baby = user.baby
+async def analysis(request: Request, baby_id: Optional[int] = None, db: Session = Depends(get_db)):
+    user = current_user(request, db)
+    baby = get_baby(db, user, baby_id)
     # Last 7 days sleep data
     today = datetime.now()
     sleep_history = []
@@ -191,13 +144,13 @@ async def analysis(request: Request, db: Session = Depends(get_db)):
             if s.end_time:
                 total_sec += (s.end_time - s.start_time).total_seconds()
         
-        sleep_history.append({"date": date.strftime("%a"), "hours": round(total_sec/3600, 1)})
+        sleep_history.append(SleepDayOut(date=date.strftime("%a"), hours=round(total_sec/3600, 1)))
     
-    return JSONResponse({
-        "sleep_history": sleep_history[::-1],
-        "total_cries": db.query(CryEvent).filter(CryEvent.baby_id == baby.id).count(),
-        "completion_rate": 85 # Dummy static logic for now
-    })
+    return model_response(AnalysisOut(
+        sleep_history=sleep_history[::-1],
+        total_cries=db.query(CryEvent).filter(CryEvent.baby_id == baby.id).count(),
+        completion_rate=85 # Dummy static logic for now
+    ))
 
 @app.post("/api/register-baby")
 async def register_baby(
@@ -207,17 +160,23 @@ async def register_baby(
     birth_date: str = Form(...),
     weight: Optional[str] = Form(None),
     photo: UploadFile = File(None),
+    baby_id: Optional[int] = Form(None),
+    household_id: Optional[int] = Form(None),
     db: Session = Depends(get_db)
 ):
-    user_id = request.session.get("user_id")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-        
-    baby = user.baby
+    user = current_user(request, db)
+    user_id = user.id
+
+    # With baby_id that profile is updated. Without it a user who owns exactly
+    # one baby updates it, as before households; otherwise a new baby is
+    # created. Babies shared with the user by other households don't count.
+    if baby_id is not None:
+        baby = get_baby(db, user, baby_id, role="owner")
+    elif household_id is None:
+        owned = user_babies(db, user, role="owner")
+        baby = owned[0] if len(owned) == 1 else None
+    else:
+        baby = None
     
     photo_url = baby.photo_url if baby else None
     if photo and photo.filename:
@@ -230,108 +189,112 @@ async def register_baby(
             shutil.copyfileobj(photo.file, buffer)
         photo_url = f"/uploads/{filename}"
         
+    profile = {"name": name, "gender": gender, "birth_date": birth_date, "weight": weight, "photo_url": photo_url}
     if baby:
-        # Update existing baby
-        baby.name = name
-        baby.gender = gender
-        baby.birth_date = birth_date
-        baby.weight = weight
-        baby.photo_url = photo_url
+        # Update existing baby; the projection applies the new profile
+        record_event(db, user, baby, "baby_updated", {"baby_id": baby.id, **profile})
         msg = "updated"
     else:
         # Create new baby
+        if household_id is not None:
+            household = get_household(db, user, household_id, role="owner")
+        else:
+            household = ensure_household(db, user)
         baby = Baby(
             name=name, 
             gender=gender, 
             birth_date=birth_date,
             weight=weight,
             photo_url=photo_url, 
-            parent_id=user.id
+            parent_id=user.id,
+            household_id=household.id
         )
         db.add(baby)
+        db.flush()
+        record_event(db, user, baby, "baby_registered", {"baby_id": baby.id, "parent_id": user.id, **profile})
         msg = "created"
-        
+
     db.commit()
-    return JSONResponse({"status": "success", "message": msg, "baby_id": baby.id})
+    return ORJSONResponse({"status": "success", "message": msg, "baby_id": baby.id})
 
 @app.post("/api/sleep/toggle")
-async def toggle_sleep(request: Request, db: Session = Depends(get_db)):
-    user_id = request.session.get("user_id")
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.baby:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-        
-    baby = user.baby
+async def toggle_sleep(request: Request, baby_id: Optional[int] = Form(None), db: Session = Depends(get_db)):
+    user = current_user(request, db)
+    baby = get_baby(db, user, baby_id, role="caregiver")
     ongoing = db.query(SleepEvent).filter(SleepEvent.baby_id == baby.id, SleepEvent.end_time == None).first()
     
     if ongoing:
-        ongoing.end_time = datetime.now()
-        ongoing.is_sleeping = False
+        record_event(db, user, baby, "sleep_ended", {"sleep_id": ongoing.id, "end_time": datetime.now()})
         msg = "sleep_ended"
     else:
         new_sleep = SleepEvent(baby_id=baby.id, start_time=datetime.now())
         db.add(new_sleep)
+        db.flush()
+        record_event(db, user, baby, "sleep_started", {"sleep_id": new_sleep.id, "start_time": new_sleep.start_time})
         msg = "sleep_started"
     
     db.commit()
-    return JSONResponse({"status": "success", "message": msg})
+    return ORJSONResponse({"status": "success", "message": msg})
 
 @app.post("/api/cry")
 async def log_cry(
     request: Request, 
     intensity: str = Form(...), 
     audio: Optional[UploadFile] = File(None),
+    baby_id: Optional[int] = Form(None),
     db: Session = Depends(get_db)
 ):
     user_id = request.session.get("user_id")
     user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.baby:
-         return JSONResponse({"status": "error", "message": "Unauthorized"}, status_code=401)
+    if not user:
+         return ORJSONResponse({"status": "error", "message": "Unauthorized"}, status_code=401)
+    baby = get_baby(db, user, baby_id, role="caregiver")
 
     audio_url = None
     if audio and audio.filename:
         upload_dir = "uploads/cries"
         os.makedirs(upload_dir, exist_ok=True)
-        filename = f"cry_{user.baby.id}_{datetime.now().strftime('%Y%m%d%H%M%S')}.webm"
+        filename = f"cry_{baby.id}_{datetime.now().strftime('%Y%m%d%H%M%S')}.webm"
         file_path = os.path.join(upload_dir, filename)
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(audio.file, buffer)
         audio_url = f"/uploads/cries/{filename}"
 
     new_cry = CryEvent(
-        baby_id=user.baby.id, 
+        baby_id=baby.id, 
         intensity=intensity, 
         timestamp=datetime.now(),
         audio_url=audio_url
     )
     db.add(new_cry)
+    db.flush()
+    record_event(db, user, baby, "cry_logged", {"cry_id": new_cry.id, "intensity": intensity, "timestamp": new_cry.timestamp, "audio_url": audio_url})
     db.commit()
-    return JSONResponse({"status": "success", "audio_url": audio_url})
+    return ORJSONResponse({"status": "success", "audio_url": audio_url})
 
 @app.post("/api/task/toggle/{task_id}")
 async def toggle_task(task_id: int, request: Request, db: Session = Depends(get_db)):
-    user_id = request.session.get("user_id")
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.baby:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-        
-    task = db.query(Task).filter(Task.id == task_id, Task.baby_id == user.baby.id).first()
+    user = current_user(request, db)
+    task = db.query(Task).filter(Task.id == task_id).first()
     if task:
-        task.is_completed = not task.is_completed
+        baby = get_baby(db, user, task.baby_id, role="caregiver")
+        record_event(db, user, baby, "task_toggled", {"task_id": task.id, "is_completed": not task.is_completed})
         db.commit()
-        return JSONResponse({"status": "success"})
+        return ORJSONResponse({"status": "success"})
     raise HTTPException(status_code=404, detail="Task not found")
 
 @app.get("/api/me")
 async def get_me(request: Request, db: Session = Depends(get_db)):
     user_id = request.session.get("user_id")
     if not user_id:
-        return JSONResponse({"authenticated": False})
+        return ORJSONResponse({"authenticated": False})
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
-        return JSONResponse({"authenticated": False})
-    return JSONResponse({
+        return ORJSONResponse({"authenticated": False})
+    babies = user_babies(db, user)
+    return ORJSONResponse({
         "authenticated": True,
         "phone_number": user.phone_number,
-        "has_baby": user.baby is not None
+        "has_baby": len(babies) > 0,
+        "babies": [{"id": b.id, "name": b.name, "household_id": b.household_id} for b in babies]
     })
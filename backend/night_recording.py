@@ -0,0 +1,327 @@
+import math
+import os
+import struct
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from operator import mul
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Request, Form, Depends, HTTPException
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+
+from db.database import get_db
+from db.models import User, CryEvent, NightRecording, RecordingUpload
+from .events import record_event
+from .households import current_user, get_baby, touch_household
+from .responses import ORJSONResponse
+
+router = APIRouter()
+
+# Audio is streamed as raw 16-bit little-endian mono PCM and stored as WAV
+SAMPLE_WIDTH = 2
+WAV_HEADER_SIZE = 44
+
+# Segmentation Settings
+FRAME_SECONDS = 0.5
+ENERGY_THRESHOLD = int(os.getenv("NIGHT_ENERGY_THRESHOLD", "1500")) # RMS of int16 samples
+QUIET_FRAMES_TO_CLOSE = 4 # 2s of quiet ends an event
+MIN_EVENT_FRAMES = 2      # ignore blips shorter than 1s
+
+# A claim left behind by a crashed worker is ignored after this long; a live
+# request renews its claim well before that while the body is streaming
+UPLOAD_LOCK_SECONDS = int(os.getenv("NIGHT_UPLOAD_LOCK_SECONDS", "300"))
+UPLOAD_LOCK_RENEW_SECONDS = UPLOAD_LOCK_SECONDS / 3
+
+def _rms(frame: bytes) -> int:
+    samples = array("h")
+    samples.frombytes(frame)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    if not samples:
+        return 0
+    return int(math.sqrt(sum(map(mul, samples, samples)) / len(samples)))
+
+def _wav_header(sample_rate: int, data_size: int) -> bytes:
+    byte_rate = sample_rate * SAMPLE_WIDTH
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, byte_rate, SAMPLE_WIDTH, SAMPLE_WIDTH * 8,
+        b"data", data_size
+    )
+
+class EnergySegmenter:
+    """
+    Single-pass energy segmenter. Audio is cut into fixed frames; a run of frames
+    whose RMS reaches the threshold becomes an event, closed after a short quiet
+    gap. Only the current frame is ever held, so memory does not grow with length.
+    """
+    def __init__(self, sample_rate: int, frame: int = 0, event_start_frame: Optional[int] = None,
+                 event_peak: int = 0, quiet_frames: int = 0, pending: bytes = b"",
+                 threshold: int = ENERGY_THRESHOLD):
+        self.frame_bytes = int(sample_rate * FRAME_SECONDS) * SAMPLE_WIDTH
+        self.threshold = threshold
+        self.frame = frame
+        self.event_start_frame = event_start_frame
+        self.event_peak = event_peak
+        self.quiet_frames = quiet_frames
+        self.pending = pending
+
+    @classmethod
+    def from_upload(cls, upload: RecordingUpload, pending: bytes = b""):
+        frame_bytes = int(upload.sample_rate * FRAME_SECONDS) * SAMPLE_WIDTH
+        return cls(
+            upload.sample_rate,
+            frame=upload.bytes_received // frame_bytes,
+            event_start_frame=upload.event_start_frame,
+            event_peak=upload.event_peak or 0,
+            quiet_frames=upload.quiet_frames or 0,
+            pending=pending
+        )
+
+    def save(self, upload: RecordingUpload):
+        upload.event_start_frame = self.event_start_frame
+        upload.event_peak = self.event_peak
+        upload.quiet_frames = self.quiet_frames
+
+    def feed(self, data: bytes) -> List[Tuple[int, int, int]]:
+        """Consumes PCM bytes and returns closed events as (start_frame, end_frame, peak_rms)."""
+        buf = self.pending + data
+        usable = len(buf) - len(buf) % self.frame_bytes
+        events = []
+        for pos in range(0, usable, self.frame_bytes):
+            self._step(_rms(buf[pos:pos + self.frame_bytes]), events)
+        self.pending = buf[usable:]
+        return events
+
+    def flush(self) -> List[Tuple[int, int, int]]:
+        """Closes an event still open at the end of the stream."""
+        events = []
+        if self.event_start_frame is not None:
+            self._close(self.frame - self.quiet_frames, events)
+        return events
+
+    def _step(self, rms: int, events: list):
+        if rms >= self.threshold:
+            if self.event_start_frame is None:
+                self.event_start_frame = self.frame
+            self.event_peak = max(self.event_peak, rms)
+            self.quiet_frames = 0
+        elif self.event_start_frame is not None:
+            self.quiet_frames += 1
+            if self.quiet_frames >= QUIET_FRAMES_TO_CLOSE:
+                self._close(self.frame - self.quiet_frames + 1, events)
+        self.frame += 1
+
+    def _close(self, end_frame: int, events: list):
+        if end_frame - self.event_start_frame >= MIN_EVENT_FRAMES:
+            events.append((self.event_start_frame, end_frame, self.event_peak))
+        self.event_start_frame = None
+        self.event_peak = 0
+        self.quiet_frames = 0
+
+# Utility Functions
+def _get_upload(db: Session, user: User, upload_id: int, role: str = "viewer") -> RecordingUpload:
+    upload = db.query(RecordingUpload).filter(RecordingUpload.id == upload_id).first()
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    get_baby(db, user, upload.baby_id, role=role)
+    return upload
+
+def _claim_upload(db: Session, upload: RecordingUpload, offset: int) -> Optional[datetime]:
+    """
+    Compare-and-set claim on the upload at `offset`, committed immediately so
+    concurrent requests (e.g. a client retrying the same chunk) see it. Only
+    the winner may touch the file. Returns the claim (its `locked_at` value),
+    which every later write checks, or None when another request holds it.
+    """
+    now = datetime.now()
+    claimed = db.query(RecordingUpload).filter(
+        RecordingUpload.id == upload.id,
+        RecordingUpload.bytes_received == offset,
+        RecordingUpload.is_complete == False,
+        or_(RecordingUpload.locked_at == None, RecordingUpload.locked_at < now - timedelta(seconds=UPLOAD_LOCK_SECONDS))
+    ).update({RecordingUpload.locked_at: now}, synchronize_session=False)
+    db.commit()
+    return now if claimed == 1 else None
+
+def _renew_claim(db: Session, upload: RecordingUpload, claim: datetime) -> Optional[datetime]:
+    now = datetime.now()
+    renewed = db.query(RecordingUpload).filter(RecordingUpload.id == upload.id, RecordingUpload.locked_at == claim).update(
+        {RecordingUpload.locked_at: now}, synchronize_session=False)
+    db.commit()
+    return now if renewed == 1 else None
+
+def _release_upload(db: Session, upload: RecordingUpload, claim: datetime, **values) -> bool:
+    """Clears the claim and stores `values` in the caller's transaction, only if the claim is still ours."""
+    released = db.query(RecordingUpload).filter(RecordingUpload.id == upload.id, RecordingUpload.locked_at == claim).update(
+        {RecordingUpload.locked_at: None, **{getattr(RecordingUpload, k): v for k, v in values.items()}}, synchronize_session=False)
+    return released == 1
+
+@contextmanager
+def _holding_claim(db: Session, upload: RecordingUpload, claim: datetime):
+    # However the block ends, anything uncommitted is dropped and a claim
+    # still held is handed back, so retries aren't locked out until it expires
+    try:
+        yield
+    finally:
+        db.rollback()
+        if _release_upload(db, upload, claim):
+            db.commit()
+
+def _claim_lost(upload: RecordingUpload):
+    return ORJSONResponse({"status": "error", "message": "Upload claimed by another request", "offset": upload.bytes_received}, status_code=409)
+
+def _write_and_feed(f, segmenter: EnergySegmenter, piece: bytes) -> List[Tuple[int, int, int]]:
+    f.write(piece)
+    return segmenter.feed(piece)
+
+def _add_cry_events(db: Session, user: User, upload: RecordingUpload, events: List[Tuple[int, int, int]]) -> int:
+    for start, end, peak in events:
+        start_sec, end_sec = start * FRAME_SECONDS, end * FRAME_SECONDS
+        cry = CryEvent(
+            baby_id=upload.baby_id,
+            intensity="High" if peak >= ENERGY_THRESHOLD * 2 else "Normal",
+            timestamp=upload.created_at + timedelta(seconds=start_sec),
+            audio_url=f"{upload.recording.audio_url}#t={start_sec:.1f},{end_sec:.1f}"
+        )
+        db.add(cry)
+        db.flush()
+        record_event(db, user, upload.recording.baby, "cry_logged", {"cry_id": cry.id, "intensity": cry.intensity, "timestamp": cry.timestamp, "audio_url": cry.audio_url})
+    return len(events)
+
+def _upload_status(upload: RecordingUpload, **extra):
+    return ORJSONResponse({
+        "status": "success",
+        "upload_id": upload.id,
+        "recording_id": upload.recording_id,
+        "offset": upload.bytes_received,
+        "duration": upload.recording.duration,
+        "is_complete": upload.is_complete,
+        **extra
+    })
+
+@router.post("/night-recording/start")
+async def start_night_recording(
+    request: Request,
+    sample_rate: int = Form(16000),
+    baby_id: Optional[int] = Form(None),
+    db: Session = Depends(get_db)
+):
+    user = current_user(request, db)
+    baby = get_baby(db, user, baby_id, role="caregiver")
+    if not 8000 <= sample_rate <= 48000:
+        raise HTTPException(status_code=400, detail="Unsupported sample rate")
+
+    upload_dir = "uploads/night"
+    os.makedirs(upload_dir, exist_ok=True)
+    now = datetime.now()
+    filename = f"night_{baby.id}_{now.strftime('%Y%m%d%H%M%S')}.wav"
+    file_path = os.path.join(upload_dir, filename)
+    with open(file_path, "wb") as f:
+        f.write(_wav_header(sample_rate, 0))
+
+    recording = NightRecording(baby_id=baby.id, timestamp=now, audio_url=f"/uploads/night/{filename}", duration=0)
+    db.add(recording)
+    db.flush()
+    upload = RecordingUpload(baby_id=baby.id, recording_id=recording.id, file_path=file_path, sample_rate=sample_rate, created_at=now)
+    db.add(upload)
+    record_event(db, user, baby, "recording_started", {"recording_id": recording.id, "timestamp": now, "audio_url": recording.audio_url})
+    db.commit()
+    return _upload_status(upload)
+
+@router.get("/night-recording/{upload_id}")
+async def night_recording_status(upload_id: int, request: Request, db: Session = Depends(get_db)):
+    return _upload_status(_get_upload(db, current_user(request, db), upload_id))
+
+@router.put("/night-recording/{upload_id}")
+async def upload_night_chunk(upload_id: int, offset: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Appends one chunk of raw PCM at `offset` (bytes of audio already stored).
+    The body is streamed straight to disk and through the segmenter. If the
+    client drops mid-chunk nothing is committed; it should re-read the offset
+    from the status endpoint and resend from there.
+    """
+    user = current_user(request, db)
+    upload = _get_upload(db, user, upload_id, role="caregiver")
+    if upload.is_complete:
+        raise HTTPException(status_code=409, detail="Recording already finished")
+    if offset != upload.bytes_received:
+        return ORJSONResponse({"status": "error", "message": "Offset mismatch", "offset": upload.bytes_received}, status_code=409)
+    claim = _claim_upload(db, upload, offset)
+    if claim is None:
+        return ORJSONResponse({"status": "error", "message": "Chunk already being uploaded", "offset": upload.bytes_received}, status_code=409)
+
+    with _holding_claim(db, upload, claim):
+        received = upload.bytes_received
+        segments = []
+        renew_at = time.monotonic() + UPLOAD_LOCK_RENEW_SECONDS
+        with open(upload.file_path, "r+b") as f:
+            # Re-read the partial frame left by the previous chunk, then drop any
+            # bytes written by an interrupted attempt past the committed offset
+            frame_bytes = int(upload.sample_rate * FRAME_SECONDS) * SAMPLE_WIDTH
+            tail = received % frame_bytes
+            f.seek(WAV_HEADER_SIZE + received - tail)
+            segmenter = EnergySegmenter.from_upload(upload, pending=f.read(tail))
+            f.seek(WAV_HEADER_SIZE + received)
+            f.truncate()
+
+            try:
+                async for piece in request.stream():
+                    # A slow client keeps its claim alive; if it expired and was
+                    # taken over anyway, stop before touching the file again
+                    if time.monotonic() >= renew_at:
+                        claim = _renew_claim(db, upload, claim)
+                        if claim is None:
+                            return _claim_lost(upload)
+                        renew_at = time.monotonic() + UPLOAD_LOCK_RENEW_SECONDS
+                    # Disk writes and segmentation stay off the event loop. Closed
+                    # segments are only collected here: writing them mid-stream
+                    # would hold the database write lock for the whole chunk
+                    segments += await run_in_threadpool(_write_and_feed, f, segmenter, piece)
+                    received += len(piece)
+            except ClientDisconnect:
+                raise HTTPException(status_code=400, detail="Upload interrupted")
+
+            f.seek(0)
+            f.write(_wav_header(upload.sample_rate, received))
+
+        if not _release_upload(db, upload, claim, bytes_received=received):
+            return _claim_lost(upload)
+        cries = _add_cry_events(db, user, upload, segments)
+        segmenter.save(upload)
+        # Progress is not logged per chunk (replays leave it alone); the final
+        # duration is, on finish
+        upload.recording.duration = received // (upload.sample_rate * SAMPLE_WIDTH)
+        touch_household(db, upload.recording.baby.household_id)
+        db.commit()
+        return _upload_status(upload, cries_detected=cries)
+
+@router.post("/night-recording/{upload_id}/finish")
+async def finish_night_recording(upload_id: int, request: Request, db: Session = Depends(get_db)):
+    user = current_user(request, db)
+    upload = _get_upload(db, user, upload_id, role="caregiver")
+    if upload.is_complete:
+        return _upload_status(upload, cries_detected=0)
+    claim = _claim_upload(db, upload, upload.bytes_received)
+    if claim is None:
+        return ORJSONResponse({"status": "error", "message": "Chunk still being uploaded", "offset": upload.bytes_received}, status_code=409)
+
+    with _holding_claim(db, upload, claim):
+        if not _release_upload(db, upload, claim, is_complete=True):
+            return _claim_lost(upload)
+        segmenter = EnergySegmenter.from_upload(upload)
+        cries = _add_cry_events(db, user, upload, segmenter.flush())
+        segmenter.save(upload)
+        record_event(db, user, upload.recording.baby, "recording_finished", {
+            "recording_id": upload.recording_id,
+            "duration": upload.bytes_received // (upload.sample_rate * SAMPLE_WIDTH)
+        })
+        db.commit()
+        return _upload_status(upload, cries_detected=cries)
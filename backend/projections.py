@@ -0,0 +1,242 @@
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from db.models import (
+    Baby, Task, SleepEvent, CryEvent, NightRecording,
+    BabyEvent, GrowthPoint, TaskHistory
+)
+
+# Weight units accepted in the free-text field, in kg. A lone bare number is kg.
+WEIGHT_UNITS = {
+    "": 1.0, "kg": 1.0, "kgs": 1.0, "kilo": 1.0, "kilos": 1.0,
+    "g": 0.001, "gr": 0.001, "gram": 0.001, "grams": 0.001,
+    "lb": 0.45359237, "lbs": 0.45359237, "pound": 0.45359237, "pounds": 0.45359237,
+    "oz": 0.028349523125, "ounce": 0.028349523125, "ounces": 0.028349523125,
+}
+# "3,400" is a thousands separator, "3,4" a decimal comma
+_THOUSANDS = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?"
+_WEIGHT_PART = re.compile(rf"\s*({_THOUSANDS}|\d+(?:[.,]\d+)?)\s*([a-z]*)\s*")
+
+def _dt(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+def parse_weight(weight) -> Optional[float]:
+    """
+    Converts free-text weights like "3.4", "3,4 kg", "3,400 g" or "7 lb 8 oz"
+    to kg. Several numbers are only combined when each has its own, distinct
+    unit. Anything else (ranges, stray numbers or words, unknown units)
+    returns None rather than a guess.
+    """
+    if weight is None:
+        return None
+    text = str(weight).lower()
+    parts, pos = [], 0
+    while pos < len(text):
+        match = _WEIGHT_PART.match(text, pos)
+        if not match or match.end() == pos:
+            return None
+        parts.append(match.groups())
+        pos = match.end()
+    units = [unit for _, unit in parts]
+    if not parts or any(unit not in WEIGHT_UNITS for unit in units):
+        return None
+    if len(parts) > 1 and ("" in units or len(set(units)) < len(units)):
+        return None
+    return round(sum(_number(n) * WEIGHT_UNITS[unit] for n, unit in parts), 3)
+
+def _number(text: str) -> float:
+    if re.fullmatch(_THOUSANDS, text):
+        return float(text.replace(",", ""))
+    return float(text.replace(",", "."))
+
+def _insert_new(db: Session, model, rows: List[dict]):
+    # Rows carry a unique event_id; skip any already written by a concurrent
+    # live write or replay instead of failing the whole batch
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    db.execute(dialect.insert(model).on_conflict_do_nothing(index_elements=["event_id"]), rows)
+
+class _Upserter:
+    """Creates or updates rows by id, remembering rows created in the current batch."""
+    def __init__(self, db: Session, rows: dict):
+        self.db = db
+        self.rows = rows
+
+    def __call__(self, model, entity_id: int, **fields):
+        row = self.rows.get((model, entity_id))
+        if row is None:
+            row = model(id=entity_id)
+            self.db.add(row)
+            self.rows[(model, entity_id)] = row
+        for key, value in fields.items():
+            setattr(row, key, value)
+
+class StateProjection:
+    """
+    Current dashboard state: the babies, tasks, sleep, cry and recording tables.
+    Handlers are idempotent upserts keyed by the ids carried in each event, so
+    a replay converges on the same rows without truncating data that predates
+    the event log.
+    """
+    name = "dashboard"
+    tables = []
+
+    # event type -> (model, payload key holding the row id)
+    TARGETS = {
+        "baby_registered": (Baby, "baby_id"),
+        "baby_updated": (Baby, "baby_id"),
+        "task_created": (Task, "task_id"),
+        "task_toggled": (Task, "task_id"),
+        "sleep_started": (SleepEvent, "sleep_id"),
+        "sleep_ended": (SleepEvent, "sleep_id"),
+        "cry_logged": (CryEvent, "cry_id"),
+        "baby_imported": (Baby, "baby_id"),
+        "recording_started": (NightRecording, "recording_id"),
+        "recording_finished": (NightRecording, "recording_id"),
+    }
+
+    def apply(self, db: Session, events: List[BabyEvent]):
+        # Load every targeted row in one query per table; rows created while
+        # applying the batch are tracked here too, as autoflush is off
+        ids = defaultdict(set)
+        for e in events:
+            if e.event_type in self.TARGETS:
+                model, key = self.TARGETS[e.event_type]
+                ids[model].add(e.payload[key])
+        rows = {}
+        for model, model_ids in ids.items():
+            for row in db.query(model).filter(model.id.in_(model_ids)):
+                rows[(model, row.id)] = row
+
+        upsert = _Upserter(db, rows)
+        for e in events:
+            handler = getattr(self, f"_on_{e.event_type}", None)
+            if handler:
+                handler(upsert, e, e.payload)
+
+    def _on_baby_registered(self, upsert, e, p):
+        upsert(Baby, p["baby_id"], household_id=e.household_id, parent_id=p.get("parent_id"), created_at=e.created_at,
+                name=p["name"], gender=p["gender"], birth_date=p["birth_date"], weight=p["weight"], photo_url=p["photo_url"])
+
+    def _on_baby_updated(self, upsert, e, p):
+        upsert(Baby, p["baby_id"], name=p["name"], gender=p["gender"], birth_date=p["birth_date"], weight=p["weight"], photo_url=p["photo_url"])
+
+    # Baseline profile logged by migration.py for babies that predate the log
+    _on_baby_imported = _on_baby_updated
+
+    def _on_task_created(self, upsert, e, p):
+        upsert(Task, p["task_id"], baby_id=e.baby_id, title=p["title"], action_type=p["action_type"], due_time=p["due_time"],
+                interval_minutes=p["interval_minutes"], interval_count=p["interval_count"], photo_url=p["photo_url"])
+
+    def _on_task_toggled(self, upsert, e, p):
+        upsert(Task, p["task_id"], is_completed=p["is_completed"], completed_at=e.created_at if p["is_completed"] else None)
+
+    def _on_sleep_started(self, upsert, e, p):
+        upsert(SleepEvent, p["sleep_id"], baby_id=e.baby_id, start_time=_dt(p["start_time"]), end_time=None, is_sleeping=True)
+
+    def _on_sleep_ended(self, upsert, e, p):
+        upsert(SleepEvent, p["sleep_id"], end_time=_dt(p["end_time"]), is_sleeping=False)
+
+    def _on_cry_logged(self, upsert, e, p):
+        upsert(CryEvent, p["cry_id"], baby_id=e.baby_id, intensity=p["intensity"], timestamp=_dt(p["timestamp"]), audio_url=p["audio_url"])
+
+    # Duration is only logged once the upload finishes. While it is still
+    # running the row tracks upload progress, which a replay leaves alone.
+    def _on_recording_started(self, upsert, e, p):
+        upsert(NightRecording, p["recording_id"], baby_id=e.baby_id, timestamp=_dt(p["timestamp"]), audio_url=p["audio_url"])
+
+    def _on_recording_finished(self, upsert, e, p):
+        upsert(NightRecording, p["recording_id"], duration=p["duration"])
+
+class GrowthProjection:
+    """Growth curve: one point per change in a baby's recorded weight."""
+    name = "growth"
+    tables = [GrowthPoint]
+
+    def apply(self, db: Session, events: List[BabyEvent]):
+        relevant = [e for e in events if e.event_type in ("baby_imported", "baby_registered", "baby_updated")]
+        if not relevant:
+            return
+
+        # Compare with the last point before this batch, not the newest row:
+        # during a replay, points for later events may already exist
+        baby_ids = {e.baby_id for e in relevant}
+        latest = db.query(func.max(GrowthPoint.event_id)).filter(GrowthPoint.baby_id.in_(baby_ids), GrowthPoint.event_id < relevant[0].id).group_by(GrowthPoint.baby_id)
+        last = dict(db.query(GrowthPoint.baby_id, GrowthPoint.weight_kg).filter(GrowthPoint.event_id.in_(latest)).all())
+
+        rows = []
+        for e in relevant:
+            weight_kg = parse_weight(e.payload.get("weight"))
+            if weight_kg is None or last.get(e.baby_id) == weight_kg:
+                continue
+            last[e.baby_id] = weight_kg
+            rows.append({"baby_id": e.baby_id, "event_id": e.id, "weight_kg": weight_kg, "measured_at": e.created_at})
+        if rows:
+            _insert_new(db, GrowthPoint, rows)
+
+class TaskHistoryProjection:
+    """Task history: who created, completed or reopened each task, and when."""
+    name = "task_history"
+    tables = [TaskHistory]
+
+    def apply(self, db: Session, events: List[BabyEvent]):
+        rows = []
+        for e in events:
+            if e.event_type == "task_created":
+                action = "created"
+            elif e.event_type == "task_toggled":
+                action = "completed" if e.payload["is_completed"] else "reopened"
+            else:
+                continue
+            rows.append({"task_id": e.payload["task_id"], "baby_id": e.baby_id, "event_id": e.id, "user_id": e.user_id, "action": action, "created_at": e.created_at})
+        if rows:
+            _insert_new(db, TaskHistory, rows)
+
+PROJECTIONS = [StateProjection(), GrowthProjection(), TaskHistoryProjection()]
+PROJECTIONS_BY_NAME: Dict[str, object] = {p.name: p for p in PROJECTIONS}
+
+def apply_projections(db: Session, events: List[BabyEvent], projections: Iterable = PROJECTIONS):
+    """Applies freshly appended events to each projection, in the caller's transaction."""
+    if not events:
+        return
+    for projection in projections:
+        projection.apply(db, events)
+
+def rebuild_projections(db: Session, names: Optional[List[str]] = None, batch_size: int = 5000, on_batch=None) -> int:
+    """
+    Rebuilds projections from the start of the event log, in keyset-paginated
+    batches committed one at a time so memory stays flat.
+
+    Growth and task history are safe to rebuild while the server runs: each
+    batch replaces the rows of its own event range in one transaction, so
+    readers never see an emptied table, and the replay stops at the newest
+    event present when it started; later events are projected by the live
+    writes themselves. The dashboard projection re-applies old state over
+    the live tables and must be rebuilt with the server stopped.
+    Returns the number of events replayed.
+    """
+    projections = [PROJECTIONS_BY_NAME[n] for n in names] if names else PROJECTIONS
+    max_id = db.query(func.max(BabyEvent.id)).scalar() or 0
+
+    last_id = 0
+    total = 0
+    while True:
+        batch = db.query(BabyEvent).filter(BabyEvent.id > last_id, BabyEvent.id <= max_id).order_by(BabyEvent.id).limit(batch_size).all()
+        if not batch:
+            break
+        for projection in projections:
+            for table in projection.tables:
+                db.query(table).filter(table.event_id.between(batch[0].id, batch[-1].id)).delete(synchronize_session=False)
+        apply_projections(db, batch, projections)
+        db.commit()
+        last_id = batch[-1].id
+        total += len(batch)
+        db.expunge_all()
+        if on_batch:
+            on_batch(total)
+    return total
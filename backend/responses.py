@@ -0,0 +1,17 @@
+from typing import Any, Optional
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson. Datetimes are encoded natively, so
+    payloads can carry ORM timestamps without per-row `.isoformat()` calls.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def model_response(model: BaseModel, include: Optional[dict] = None, status_code: int = 200) -> ORJSONResponse:
+    # model_dump in python mode keeps datetimes as objects for orjson to encode
+    return ORJSONResponse(model.model_dump(include=include), status_code=status_code)
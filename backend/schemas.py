@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, get_args, get_origin
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict
+
+# Response Models
+class ORMModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+class BabyOut(ORMModel):
+    id: int
+    name: Optional[str] = None
+    gender: Optional[str] = None
+    birth_date: Optional[str] = None
+    weight: Optional[str] = None
+    photo_url: Optional[str] = None
+
+class CryOut(ORMModel):
+    id: int
+    intensity: Optional[str] = None
+    timestamp: datetime
+    audio_url: Optional[str] = None
+
+class TaskOut(ORMModel):
+    id: int
+    title: Optional[str] = None
+    is_completed: bool = False
+    due_time: Optional[str] = None
+    category: Optional[str] = None
+    action_type: Optional[str] = None
+    interval_minutes: Optional[int] = None
+    interval_count: Optional[int] = None
+    photo_url: Optional[str] = None
+
+class NightRecordingOut(ORMModel):
+    id: int
+    timestamp: datetime
+    audio_url: Optional[str] = None
+    duration: Optional[int] = None
+
+class DashboardOut(BaseModel):
+    baby: Optional[BabyOut] = None
+    ongoing_sleep: Optional[int] = None
+    recent_cries: List[CryOut] = []
+    cry_count_today: int = 0
+    sleep_count_today: int = 0
+    sleep_duration_today: str = "0h 0m"
+    tasks: List[TaskOut] = []
+    night_recordings: List[NightRecordingOut] = []
+
+class HouseholdDashboardOut(BaseModel):
+    id: int
+    name: Optional[str] = None
+    babies: List[DashboardOut] = []
+
+class SleepDayOut(BaseModel):
+    date: str
+    hours: float
+
+class AnalysisOut(BaseModel):
+    sleep_history: List[SleepDayOut]
+    total_cries: int
+    completion_rate: int
+
+class EventOut(BaseModel):
+    id: int
+    event_type: str
+    payload: Dict[str, Any]
+    user_id: Optional[int] = None
+    phone_number: Optional[str] = None
+    created_at: datetime
+
+class EventLogOut(BaseModel):
+    events: List[EventOut]
+
+class GrowthPointOut(ORMModel):
+    weight_kg: float
+    measured_at: datetime
+
+class GrowthOut(BaseModel):
+    points: List[GrowthPointOut]
+
+class TaskHistoryOut(ORMModel):
+    task_id: int
+    action: str
+    user_id: Optional[int] = None
+    created_at: datetime
+
+class TaskHistoryLogOut(BaseModel):
+    history: List[TaskHistoryOut]
+
+# Sparse Fieldsets
+def parse_fields(model: type, fields: Optional[str]):
+    """
+    Turns a `?fields=baby.name,tasks.title,cry_count_today` query value into a
+    pydantic `include` mapping for `model`. Returns None when no filter is given.
+    Unknown names are rejected with a 400 so typos don't silently empty a payload.
+    """
+    if not fields:
+        return None
+
+    include = {}
+    for path in fields.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        _add_path(model, include, path.split("."), path)
+    return include
+
+def _add_path(model: type, include: dict, parts: List[str], path: str):
+    name = parts[0]
+    if name not in model.model_fields:
+        raise HTTPException(status_code=400, detail=f"Unknown field: {path}")
+
+    annotation = model.model_fields[name].annotation
+    is_list = get_origin(annotation) in (list, List)
+    nested = _nested_model(annotation)
+
+    if len(parts) == 1 or nested is None:
+        if len(parts) > 1:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {path}")
+        include[name] = True
+        return
+
+    if include.get(name) is True:
+        return
+    sub = include.setdefault(name, {"__all__": {}} if is_list else {})
+    _add_path(nested, sub["__all__"] if is_list else sub, parts[1:], path)
+
+def _nested_model(annotation):
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        found = _nested_model(arg)
+        if found is not None:
+            return found
+    return None
@@ -0,0 +1,172 @@
+"""
+Dashboard serialization benchmark.
+
+Seeds an in-memory SQLite database with one baby carrying hundreds of tasks,
+cries and night recordings, then compares the old hand-built dict +
+`JSONResponse` path against the typed `DashboardOut` + orjson path.
+
+Two sections are reported, both per call:
+- end to end: queries -> payload -> response bytes
+- build + render: already-loaded rows -> payload -> response bytes, which
+  isolates the model validation and JSON encoding cost
+Bytes on the wire are reported raw and gzipped.
+
+Usage: python bench_dashboard.py [--tasks 500] [--events 500] [--runs 200]
+"""
+import argparse
+import gzip
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.responses import JSONResponse
+
+from db.database import Base
+from db.models import User, Household, HouseholdMember, Baby, SleepEvent, CryEvent, Task, NightRecording
+from backend.dashboard import get_dashboard_data
+from backend.responses import model_response
+from backend.schemas import DashboardOut, BabyOut, CryOut, TaskOut, NightRecordingOut, parse_fields
+
+def seed(db, n_tasks, n_events):
+    user = User(phone_number="9999999999")
+    household = Household(name="Bench Family", version=0)
+    db.add_all([user, household])
+    db.flush()
+    db.add(HouseholdMember(household_id=household.id, user_id=user.id, role="owner"))
+    baby = Baby(name="Bench Baby", gender="Girl", birth_date="2026-01-01", weight="3.4", photo_url="/uploads/bench.png", parent_id=user.id, household_id=household.id)
+    db.add(baby)
+    db.flush()
+
+    now = datetime.now()
+    db.add_all([Task(
+        baby_id=baby.id,
+        title=f"Task {i}",
+        is_completed=i % 3 == 0,
+        due_time="08:30",
+        action_type="Daily",
+        interval_minutes=30,
+        interval_count=2,
+        photo_url=f"/uploads/tasks/task_{i}.png"
+    ) for i in range(n_tasks)])
+    db.add_all([CryEvent(baby_id=baby.id, intensity="High", timestamp=now - timedelta(minutes=i), audio_url=f"/uploads/cries/cry_{i}.webm") for i in range(n_events)])
+    db.add_all([SleepEvent(baby_id=baby.id, start_time=now - timedelta(hours=i), end_time=now - timedelta(hours=i) + timedelta(minutes=40), is_sleeping=False) for i in range(n_events)])
+    db.add_all([NightRecording(baby_id=baby.id, timestamp=now - timedelta(minutes=i), audio_url=f"/uploads/night/rec_{i}.webm", duration=60) for i in range(n_events)])
+    db.commit()
+    return baby
+
+def legacy_dashboard(db, baby):
+    # The pre-schema get_dashboard_data: per-baby queries, hand-built dicts,
+    # isoformat() per timestamp, rendered by the stdlib-json JSONResponse
+    ongoing_sleep = db.query(SleepEvent).filter(SleepEvent.baby_id == baby.id, SleepEvent.end_time == None).first()
+    recent_cries = db.query(CryEvent).filter(CryEvent.baby_id == baby.id).order_by(CryEvent.timestamp.desc()).limit(5).all()
+    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    cry_count_today = db.query(CryEvent).filter(CryEvent.baby_id == baby.id, CryEvent.timestamp >= today_start).count()
+    sleeps_today = db.query(SleepEvent).filter(SleepEvent.baby_id == baby.id, SleepEvent.start_time >= today_start).all()
+    total_sleep_seconds = 0
+    for s in sleeps_today:
+        if s.end_time:
+            total_sleep_seconds += (s.end_time - s.start_time).total_seconds()
+        elif s.is_sleeping:
+            total_sleep_seconds += (datetime.now() - s.start_time).total_seconds()
+    tasks = db.query(Task).filter(Task.baby_id == baby.id).all()
+    night_recordings = db.query(NightRecording).filter(NightRecording.baby_id == baby.id).order_by(NightRecording.timestamp.desc()).limit(10).all()
+    return legacy_payload(baby, ongoing_sleep, recent_cries, cry_count_today, len(sleeps_today), total_sleep_seconds, tasks, night_recordings)
+
+def legacy_payload(baby, ongoing_sleep, recent_cries, cry_count_today, sleep_count_today, total_sleep_seconds, tasks, night_recordings):
+    hours = int(total_sleep_seconds // 3600)
+    minutes = int((total_sleep_seconds % 3600) // 60)
+    return {
+        "baby": {"id": baby.id, "name": baby.name, "gender": baby.gender, "birth_date": baby.birth_date, "weight": baby.weight, "photo_url": baby.photo_url},
+        "ongoing_sleep": ongoing_sleep.id if ongoing_sleep else None,
+        "recent_cries": [{"id": c.id, "intensity": c.intensity, "timestamp": c.timestamp.isoformat(), "audio_url": c.audio_url} for c in recent_cries],
+        "cry_count_today": cry_count_today,
+        "sleep_count_today": sleep_count_today,
+        "sleep_duration_today": f"{hours}h {minutes}m",
+        "tasks": [{
+            "id": t.id,
+            "title": t.title,
+            "is_completed": t.is_completed,
+            "due_time": t.due_time,
+            "category": t.category,
+            "action_type": t.action_type,
+            "interval_minutes": t.interval_minutes,
+            "interval_count": t.interval_count,
+            "photo_url": t.photo_url
+        } for t in tasks],
+        "night_recordings": [{"id": n.id, "timestamp": n.timestamp.isoformat(), "audio_url": n.audio_url, "duration": n.duration} for n in night_recordings]
+    }
+
+def schema_payload(baby, ongoing_sleep, recent_cries, cry_count_today, sleep_count_today, sleep_duration_today, tasks, night_recordings):
+    # Same validation get_dashboard_data does over the column rows it loads
+    return DashboardOut.model_validate({
+        "baby": BabyOut.model_validate(baby),
+        "ongoing_sleep": ongoing_sleep,
+        "recent_cries": recent_cries,
+        "cry_count_today": cry_count_today,
+        "sleep_count_today": sleep_count_today,
+        "sleep_duration_today": sleep_duration_today,
+        "tasks": tasks,
+        "night_recordings": night_recordings
+    })
+
+def column_rows(db, model, schema, *criteria, order_by, limit=None):
+    stmt = select(*[getattr(model, name) for name in schema.model_fields]).where(*criteria).order_by(order_by).limit(limit)
+    result = db.execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def measure(label, render, runs):
+    body = render()
+    start = time.perf_counter()
+    for _ in range(runs):
+        render()
+    per_call = (time.perf_counter() - start) / runs * 1000
+    print(f"{label:<34} {per_call:8.3f} ms   {len(body):>8} B   {len(gzip.compress(body)):>7} B gzip")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    baby = seed(db, args.tasks, args.events)
+    data = get_dashboard_data(db, [baby])[0]
+    sparse = parse_fields(DashboardOut, "baby.name,cry_count_today,sleep_duration_today,tasks.id,tasks.title,tasks.is_completed")
+
+    # Rows as each path loads them (ORM objects for legacy, column dicts for
+    # DashboardOut), for the build + render section
+    tasks = db.query(Task).filter(Task.baby_id == baby.id).all()
+    cries = db.query(CryEvent).filter(CryEvent.baby_id == baby.id).order_by(CryEvent.timestamp.desc()).limit(5).all()
+    recordings = db.query(NightRecording).filter(NightRecording.baby_id == baby.id).order_by(NightRecording.timestamp.desc()).limit(10).all()
+    rows = (baby, None, cries, data.cry_count_today, data.sleep_count_today)
+    column_data = (
+        baby, None,
+        column_rows(db, CryEvent, CryOut, CryEvent.baby_id == baby.id, order_by=CryEvent.timestamp.desc(), limit=5),
+        data.cry_count_today, data.sleep_count_today, "0h 0m",
+        column_rows(db, Task, TaskOut, Task.baby_id == baby.id, order_by=Task.id),
+        column_rows(db, NightRecording, NightRecordingOut, NightRecording.baby_id == baby.id, order_by=NightRecording.timestamp.desc(), limit=10)
+    )
+
+    print(f"Dashboard: {len(data.tasks)} tasks, {len(data.recent_cries)} cries, {len(data.night_recordings)} recordings, {args.runs} runs")
+    header = f"{'path':<34} {'per call':>11}   {'raw':>10}   {'compressed':>12}"
+
+    print("\nEnd to end (queries + build + render)")
+    print(header)
+    measure("dict + JSONResponse (legacy)", lambda: JSONResponse(legacy_dashboard(db, baby)).body, args.runs)
+    measure("DashboardOut + orjson", lambda: model_response(get_dashboard_data(db, [baby])[0]).body, args.runs)
+    measure("DashboardOut + orjson ?fields=", lambda: model_response(get_dashboard_data(db, [baby])[0], sparse).body, args.runs)
+
+    print("\nBuild + render from loaded rows")
+    print(header)
+    measure("dict + JSONResponse (legacy)", lambda: JSONResponse(legacy_payload(*rows, 0, tasks, recordings)).body, args.runs)
+    measure("DashboardOut + orjson", lambda: model_response(schema_payload(*column_data)).body, args.runs)
+    measure("DashboardOut + orjson ?fields=", lambda: model_response(schema_payload(*column_data), sparse).body, args.runs)
+
+if __name__ == "__main__":
+    main()
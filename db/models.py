@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, JSON, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -9,7 +9,29 @@ class User(Base):
     phone_number = Column(String, unique=True, index=True)
     created_at = Column(DateTime, default=datetime.now)
     
-    baby = relationship("Baby", uselist=False, back_populates="parent")
+    memberships = relationship("HouseholdMember", back_populates="user")
+
+class Household(Base):
+    __tablename__ = "households"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String)
+    version = Column(Integer, default=0) # Bumped on every write, keys shared caches
+    created_at = Column(DateTime, default=datetime.now)
+
+    members = relationship("HouseholdMember", back_populates="household")
+    babies = relationship("Baby", back_populates="household")
+
+class HouseholdMember(Base):
+    __tablename__ = "household_members"
+    __table_args__ = (UniqueConstraint("household_id", "user_id"),)
+    id = Column(Integer, primary_key=True, index=True)
+    household_id = Column(Integer, ForeignKey("households.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    role = Column(String, default="caregiver") # owner, caregiver, viewer
+    created_at = Column(DateTime, default=datetime.now)
+
+    household = relationship("Household", back_populates="members")
+    user = relationship("User", back_populates="memberships")
 
 class Baby(Base):
     __tablename__ = "babies"
@@ -19,10 +41,12 @@ class Baby(Base):
     birth_date = Column(String, nullable=True)
     weight = Column(String, nullable=True)
     photo_url = Column(String, nullable=True)
-    parent_id = Column(Integer, ForeignKey("users.id"))
+    parent_id = Column(Integer, ForeignKey("users.id")) # Caregiver who registered the baby
+    household_id = Column(Integer, ForeignKey("households.id"), index=True)
     created_at = Column(DateTime, default=datetime.now)
     
-    parent = relationship("User", back_populates="baby")
+    parent = relationship("User")
+    household = relationship("Household", back_populates="babies")
     sleeps = relationship("SleepEvent", back_populates="baby")
     cries = relationship("CryEvent", back_populates="baby")
     tasks = relationship("Task", back_populates="baby")
@@ -31,7 +55,7 @@ class Baby(Base):
 class SleepEvent(Base):
     __tablename__ = "sleep_events"
     id = Column(Integer, primary_key=True, index=True)
-    baby_id = Column(Integer, ForeignKey("babies.id"))
+    baby_id = Column(Integer, ForeignKey("babies.id"), index=True)
     start_time = Column(DateTime, default=datetime.now)
     end_time = Column(DateTime, nullable=True)
     is_sleeping = Column(Boolean, default=True)
@@ -41,7 +65,7 @@ class SleepEvent(Base):
 class CryEvent(Base):
     __tablename__ = "cry_events"
     id = Column(Integer, primary_key=True, index=True)
-    baby_id = Column(Integer, ForeignKey("babies.id"))
+    baby_id = Column(Integer, ForeignKey("babies.id"), index=True)
     timestamp = Column(DateTime, default=datetime.now)
     intensity = Column(String, default="Normal")
     audio_url = Column(String, nullable=True)
@@ -51,7 +75,7 @@ class CryEvent(Base):
 class Task(Base):
     __tablename__ = "tasks"
     id = Column(Integer, primary_key=True, index=True)
-    baby_id = Column(Integer, ForeignKey("babies.id"))
+    baby_id = Column(Integer, ForeignKey("babies.id"), index=True)
     title = Column(String) # Task Name
     is_completed = Column(Boolean, default=False)
     due_time = Column(String, nullable=True) # Selected Time
@@ -70,13 +94,67 @@ class Task(Base):
 class NightRecording(Base):
     __tablename__ = "night_recordings"
     id = Column(Integer, primary_key=True, index=True)
-    baby_id = Column(Integer, ForeignKey("babies.id"))
+    baby_id = Column(Integer, ForeignKey("babies.id"), index=True)
     timestamp = Column(DateTime, default=datetime.now)
     audio_url = Column(String)
-    duration = Column(Integer)
+    duration = Column(Integer, default=0) # seconds uploaded so far, final once finished
     
     baby = relationship("Baby", back_populates="night_recordings")
 
+class RecordingUpload(Base):
+    __tablename__ = "recording_uploads"
+    id = Column(Integer, primary_key=True, index=True)
+    baby_id = Column(Integer, ForeignKey("babies.id"), index=True)
+    recording_id = Column(Integer, ForeignKey("night_recordings.id"))
+    file_path = Column(String)
+    sample_rate = Column(Integer, default=16000)
+    bytes_received = Column(Integer, default=0) # PCM bytes committed to disk
+    is_complete = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.now)
+    locked_at = Column(DateTime, nullable=True) # set while a chunk is streaming
+
+    # Segmenter state, carried between chunks
+    event_start_frame = Column(Integer, nullable=True)
+    event_peak = Column(Integer, default=0)
+    quiet_frames = Column(Integer, default=0)
+
+    recording = relationship("NightRecording")
+
+# Append-only log of every baby-related write, never updated or deleted
+class BabyEvent(Base):
+    __tablename__ = "baby_events"
+    id = Column(Integer, primary_key=True, index=True)
+    baby_id = Column(Integer, ForeignKey("babies.id"), index=True)
+    household_id = Column(Integer, ForeignKey("households.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True) # Caregiver who made the change
+    event_type = Column(String, index=True)
+    payload = Column(JSON)
+    created_at = Column(DateTime, default=datetime.now)
+
+    user = relationship("User")
+
+# Read models rebuilt from the event log (see backend/projections.py), at most
+# one row per event so replays and live writes can't duplicate each other
+class GrowthPoint(Base):
+    __tablename__ = "growth_points"
+    __table_args__ = (UniqueConstraint("event_id"),)
+    id = Column(Integer, primary_key=True, index=True)
+    baby_id = Column(Integer, ForeignKey("babies.id"), index=True)
+    event_id = Column(Integer, ForeignKey("baby_events.id"))
+    weight_kg = Column(Float)
+    measured_at = Column(DateTime)
+
+class TaskHistory(Base):
+    __tablename__ = "task_history"
+    __table_args__ = (UniqueConstraint("event_id"),)
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey("tasks.id"), index=True)
+    baby_id = Column(Integer, ForeignKey("babies.id"), index=True)
+    event_id = Column(Integer, ForeignKey("baby_events.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    action = Column(String) # created, completed, reopened
+    created_at = Column(DateTime)
+
 class OTP(Base):
     __tablename__ = "otps"
     id = Column(Integer, primary_key=True, index=True)
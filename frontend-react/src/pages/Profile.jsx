@@ -13,6 +13,7 @@ const Profile = ({ onUpdate }) => {
   });
   const [photo, setPhoto] = useState(null);
   const [preview, setPreview] = useState(null);
+  const [babyId, setBabyId] = useState(null);
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
 
@@ -25,6 +26,7 @@ const Profile = ({ onUpdate }) => {
       const res = await api.get('/dashboard');
       if (res.data.baby) {
         const b = res.data.baby;
+        setBabyId(b.id);
         setFormData({
           name: b.name || '',
           gender: b.gender || 'Girl',
@@ -57,6 +59,7 @@ const Profile = ({ onUpdate }) => {
       const data = new FormData();
       Object.keys(formData).forEach(key => data.append(key, formData[key]));
       if (photo) data.append('photo', photo);
+      if (babyId) data.append('baby_id', babyId);
 
       // Note: Reusing register-baby logic as backend doesn't have update yet.
       // But in a real app, we'd call a dedicated update endpoint.
@@ -26,7 +26,7 @@ const Tasks = () => {
 
   const fetchTasks = async () => {
     try {
-      const res = await api.get('/dashboard');
+      const res = await api.get('/dashboard', { params: { fields: 'tasks' } });
       setTasks(res.data.tasks || []);
     } catch (err) {
       console.error(err);
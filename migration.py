@@ -1,14 +1,24 @@
 import sqlite3
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from db.database import Base, SQLITE_URL
+from db.models import Baby, BabyEvent  # also registers every table on Base
+from backend.projections import apply_projections
 
 def migrate():
     try:
+        # New tables (households, household_members, ...) are created as usual
+        engine = create_engine(SQLITE_URL)
+        Base.metadata.create_all(bind=engine)
+
         conn = sqlite3.connect('baby_tracker.db')
         cursor = conn.cursor()
-        
+
         # Check if gender column exists in babies table
         cursor.execute("PRAGMA table_info(babies)")
         columns = [row[1] for row in cursor.fetchall()]
-        
+
         if 'gender' not in columns:
             print("Adding 'gender' column...")
             cursor.execute("ALTER TABLE babies ADD COLUMN gender TEXT DEFAULT 'Girl'")
@@ -18,11 +28,52 @@ def migrate():
         if 'weight' not in columns:
             print("Adding 'weight' column...")
             cursor.execute("ALTER TABLE babies ADD COLUMN weight TEXT")
-            
+        if 'household_id' not in columns:
+            print("Adding 'household_id' column...")
+            cursor.execute("ALTER TABLE babies ADD COLUMN household_id INTEGER REFERENCES households(id)")
+
+        # Move babies registered before households into one owned by their parent
+        cursor.execute("SELECT id, parent_id FROM babies WHERE household_id IS NULL AND parent_id IS NOT NULL")
+        for baby_id, parent_id in cursor.fetchall():
+            cursor.execute("SELECT household_id FROM household_members WHERE user_id = ? AND role = 'owner' ORDER BY household_id LIMIT 1", (parent_id,))
+            row = cursor.fetchone()
+            if row:
+                household_id = row[0]
+            else:
+                print(f"Creating household for user {parent_id}...")
+                cursor.execute("INSERT INTO households (name, version, created_at) VALUES ('My Family', 0, CURRENT_TIMESTAMP)")
+                household_id = cursor.lastrowid
+                cursor.execute("INSERT INTO household_members (household_id, user_id, role, created_at) VALUES (?, ?, 'owner', CURRENT_TIMESTAMP)", (household_id, parent_id))
+            cursor.execute("UPDATE babies SET household_id = ? WHERE id = ?", (household_id, baby_id))
+
+        # Batched household dashboards filter every event table by baby_id
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_babies_household_id ON babies (household_id)")
+        for table in ("sleep_events", "cry_events", "tasks", "night_recordings"):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_baby_id ON {table} (baby_id)")
+
         conn.commit()
-        print("Migration check complete.")
-            
         conn.close()
+
+        # Babies registered before the event log get a baseline event with
+        # their current profile, so an existing weight starts the growth curve
+        db = Session(bind=engine)
+        logged = db.query(BabyEvent.baby_id).distinct()
+        events = [BabyEvent(
+            baby_id=baby.id,
+            household_id=baby.household_id,
+            event_type="baby_imported",
+            payload={"baby_id": baby.id, "name": baby.name, "gender": baby.gender, "birth_date": baby.birth_date, "weight": baby.weight, "photo_url": baby.photo_url},
+            created_at=baby.created_at or datetime.now()
+        ) for baby in db.query(Baby).filter(Baby.id.notin_(logged)).order_by(Baby.id)]
+        if events:
+            print(f"Logging baseline events for {len(events)} babies...")
+            db.add_all(events)
+            db.flush()
+            apply_projections(db, events)
+            db.commit()
+        db.close()
+
+        print("Migration check complete.")
     except Exception as e:
         print(f"Migration error: {e}")
 
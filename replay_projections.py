@@ -0,0 +1,40 @@
+"""
+Rebuilds read models from the baby event log.
+
+Usage: python replay_projections.py [--projection growth --projection task_history] [--batch-size 5000]
+Without --projection every projection is rebuilt. growth and task_history
+are replaced batch by batch and can be rebuilt while the server runs. The
+dashboard projection re-applies events over the live tables: stop the
+server before rebuilding it.
+"""
+import argparse
+import time
+
+from db.database import Base, SessionLocal, engine
+from backend.projections import PROJECTIONS_BY_NAME, rebuild_projections
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projection", action="append", choices=sorted(PROJECTIONS_BY_NAME))
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    start = time.perf_counter()
+
+    def progress(total):
+        elapsed = time.perf_counter() - start
+        print(f"  {total} events replayed ({total / elapsed:,.0f} events/s)")
+
+    try:
+        names = args.projection or sorted(PROJECTIONS_BY_NAME)
+        print(f"Rebuilding projections: {', '.join(names)}")
+        total = rebuild_projections(db, args.projection, batch_size=args.batch_size, on_batch=progress)
+        elapsed = time.perf_counter() - start
+        print(f"Replay complete: {total} events in {elapsed:.2f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import itertools
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Tests import the app packages (backend, db) from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Point the app at a throwaway SQLite database before db.database is imported,
+# so the suite never touches baby_tracker.db
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db?check_same_thread=false"
+
+_phones = itertools.count(5550000000)
+
+@pytest.fixture
+def db():
+    from db.database import SessionLocal
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def login(tmp_path, monkeypatch):
+    """Returns a function that signs a new (or given) phone number in through the OTP flow."""
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    from db.database import SessionLocal
+    from db.models import OTP
+
+    monkeypatch.chdir(tmp_path) # uploads land in the test's directory
+
+    def _login(phone: str = None) -> TestClient:
+        phone = phone or str(next(_phones))
+        client = TestClient(app)
+        client.post("/api/login/otp", data={"phone": phone})
+        session = SessionLocal()
+        otp = session.query(OTP).filter(OTP.phone_number == phone).order_by(OTP.id.desc()).first().otp_code
+        session.close()
+        assert client.post("/api/login/verify", data={"phone": phone, "otp": otp}).status_code == 200
+        client.phone = phone
+        return client
+    return _login
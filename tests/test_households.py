@@ -0,0 +1,81 @@
+import pytest
+
+BABY = {"name": "Ada", "gender": "Girl", "birth_date": "2026-01-01", "weight": "3.2"}
+
+@pytest.fixture
+def family(login):
+    """An owner's household with a viewer and a caregiver invited, plus an outsider with their own baby."""
+    owner, viewer, caregiver, outsider = login(), login(), login(), login()
+    baby_id = owner.post("/api/register-baby", data=BABY).json()["baby_id"]
+    household_id = owner.get("/api/households").json()["households"][0]["id"]
+    assert owner.post(f"/api/households/{household_id}/members", data={"phone": viewer.phone, "role": "viewer"}).status_code == 200
+    assert owner.post(f"/api/households/{household_id}/members", data={"phone": caregiver.phone, "role": "caregiver"}).status_code == 200
+    other_baby_id = outsider.post("/api/register-baby", data={**BABY, "name": "Bo"}).json()["baby_id"]
+    return {
+        "owner": owner, "viewer": viewer, "caregiver": caregiver, "outsider": outsider,
+        "baby_id": baby_id, "household_id": household_id, "other_baby_id": other_baby_id
+    }
+
+def _writes(client, baby_id):
+    return {
+        "cry": client.post("/api/cry", data={"intensity": "High", "baby_id": baby_id}).status_code,
+        "sleep": client.post("/api/sleep/toggle", data={"baby_id": baby_id}).status_code,
+        "task": client.post("/api/task/create", data={"title": "Feed", "baby_id": baby_id}).status_code,
+        "profile": client.post("/api/register-baby", data={**BABY, "baby_id": baby_id}).status_code,
+    }
+
+def test_role_gates_writes(family):
+    baby_id = family["baby_id"]
+    assert _writes(family["viewer"], baby_id) == {"cry": 403, "sleep": 403, "task": 403, "profile": 403}
+    assert _writes(family["caregiver"], baby_id) == {"cry": 200, "sleep": 200, "task": 200, "profile": 403}
+    assert _writes(family["owner"], baby_id) == {"cry": 200, "sleep": 200, "task": 200, "profile": 200}
+    assert family["viewer"].get("/api/dashboard", params={"baby_id": baby_id}).status_code == 200
+
+def test_only_owners_manage_members(family):
+    path = f"/api/households/{family['household_id']}/members"
+    assert family["caregiver"].post(path, data={"phone": "5559999999", "role": "viewer"}).status_code == 403
+    assert family["viewer"].delete(f"{path}/1").status_code == 403
+
+def test_household_keeps_an_owner(family, db):
+    from db.models import User
+    owner, caregiver = family["owner"], family["caregiver"]
+    path = f"/api/households/{family['household_id']}/members"
+    owner_id = db.query(User.id).filter(User.phone_number == owner.phone).scalar()
+
+    assert owner.post(path, data={"phone": owner.phone, "role": "caregiver"}).status_code == 400
+    assert owner.delete(f"{path}/{owner_id}").status_code == 400
+
+    assert owner.post(path, data={"phone": caregiver.phone, "role": "owner"}).status_code == 200
+    assert owner.post(path, data={"phone": owner.phone, "role": "caregiver"}).status_code == 200
+    caregiver_id = db.query(User.id).filter(User.phone_number == caregiver.phone).scalar()
+    assert caregiver.delete(f"{path}/{caregiver_id}").status_code == 400
+
+def test_baby_in_another_household_is_not_found(family):
+    outsider, baby_id = family["outsider"], family["baby_id"]
+    assert outsider.get("/api/dashboard", params={"baby_id": baby_id}).status_code == 404
+    assert outsider.post("/api/cry", data={"intensity": "High", "baby_id": baby_id}).status_code == 404
+    assert outsider.post("/api/sleep/toggle", data={"baby_id": baby_id}).status_code == 404
+    assert outsider.get(f"/api/babies/{baby_id}/events").status_code == 404
+    assert outsider.get(f"/api/households/{family['household_id']}/dashboard").status_code == 404
+
+def test_register_without_baby_id_updates_only_an_owned_only_baby(family):
+    owner, viewer = family["owner"], family["viewer"]
+    # The owner's single baby is updated in place, as before households
+    assert owner.post("/api/register-baby", data={**BABY, "name": "Ada L."}).json() == {"status": "success", "message": "updated", "baby_id": family["baby_id"]}
+    # A viewer of someone else's baby registers their own instead of being refused
+    created = viewer.post("/api/register-baby", data={**BABY, "name": "Cy"})
+    assert created.status_code == 200 and created.json()["message"] == "created"
+    assert {b["name"] for b in viewer.get("/api/me").json()["babies"]} == {"Ada L.", "Cy"}
+
+def test_shared_cache_is_invalidated_by_writes(family):
+    viewer, caregiver, baby_id = family["viewer"], family["caregiver"], family["baby_id"]
+    for path in (f"/api/dashboard?baby_id={baby_id}", f"/api/households/{family['household_id']}/dashboard"):
+        first = viewer.get(path)
+        etag = first.headers["etag"]
+        assert viewer.get(path, headers={"If-None-Match": etag}).status_code == 304
+        # Another caregiver's write bumps Household.version for everyone
+        assert caregiver.post("/api/cry", data={"intensity": "High", "baby_id": baby_id}).status_code == 200
+        fresh = viewer.get(path, headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.headers["etag"] != etag
+        assert fresh.json() != first.json()
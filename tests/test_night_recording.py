@@ -0,0 +1,63 @@
+import math
+import struct
+from types import SimpleNamespace
+
+from backend.night_recording import EnergySegmenter, FRAME_SECONDS, SAMPLE_WIDTH
+
+SAMPLE_RATE = 8000
+FRAME_BYTES = int(SAMPLE_RATE * FRAME_SECONDS) * SAMPLE_WIDTH
+
+def tone(seconds: float, amplitude: int) -> bytes:
+    n = int(SAMPLE_RATE * seconds)
+    return struct.pack(f"<{n}h", *(int(amplitude * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE)) for i in range(n)))
+
+def night() -> bytes:
+    # quiet, a loud cry, a sub-second blip (ignored), a normal cry, and a
+    # loud cry still open when the stream ends
+    return b"".join([
+        tone(2, 100), tone(3, 8000), tone(3, 100),
+        tone(0.5, 8000), tone(3, 100),
+        tone(1.5, 3000), tone(2.5, 100),
+        tone(2, 8000),
+    ])
+
+def segment(audio: bytes, chunk_sizes) -> list:
+    segmenter = EnergySegmenter(SAMPLE_RATE)
+    events, pos, i = [], 0, 0
+    while pos < len(audio):
+        size = chunk_sizes[i % len(chunk_sizes)]
+        events += segmenter.feed(audio[pos:pos + size])
+        pos += size
+        i += 1
+    return events + segmenter.flush()
+
+def test_one_chunk_detects_cries():
+    events = segment(night(), [len(night())])
+    assert [(start, end) for start, end, _ in events] == [(4, 10), (23, 26), (31, 35)]
+    assert all(peak >= 5000 for _, _, peak in events[::2])
+    assert 1500 <= events[1][2] < 3000
+
+def test_odd_sized_chunks_match_one_chunk():
+    audio = night()
+    expected = segment(audio, [len(audio)])
+    assert segment(audio, [1]) == expected
+    assert segment(audio, [997, 3, 4001, FRAME_BYTES + 1]) == expected
+
+def test_resuming_from_saved_upload_matches_one_chunk():
+    # Mirrors upload_night_chunk: every chunk builds a fresh segmenter from the
+    # upload row plus the partial frame re-read from disk, and saves it back
+    audio = night()
+    expected = segment(audio, [len(audio)])
+    upload = SimpleNamespace(sample_rate=SAMPLE_RATE, bytes_received=0, event_start_frame=None, event_peak=0, quiet_frames=0)
+    events = []
+    for size in [12345, 7, 30001, 999, 4000, len(audio)]:
+        received = upload.bytes_received
+        tail = received % FRAME_BYTES
+        segmenter = EnergySegmenter.from_upload(upload, pending=audio[received - tail:received])
+        events += segmenter.feed(audio[received:received + size])
+        upload.bytes_received = min(received + size, len(audio))
+        segmenter.save(upload)
+        if upload.bytes_received == len(audio):
+            break
+    events += EnergySegmenter.from_upload(upload).flush()
+    assert events == expected
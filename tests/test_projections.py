@@ -0,0 +1,82 @@
+import pytest
+
+from backend.projections import PROJECTIONS_BY_NAME, parse_weight, rebuild_projections
+from db.models import Baby, Task, SleepEvent, CryEvent, NightRecording, GrowthPoint, TaskHistory
+
+BABY = {"name": "Ada", "gender": "Girl", "birth_date": "2026-01-01"}
+
+@pytest.mark.parametrize("text, kg", [
+    ("3.4", 3.4),
+    ("3,4 kg", 3.4),
+    (" 3.2 KG ", 3.2),
+    ("3400 g", 3.4),
+    ("3,400 g", 3.4),
+    ("7 lb", 3.175),
+    ("7 lb 8 oz", 3.402),
+    ("7lbs 8oz", 3.402),
+    ("3 kg 200 g", 3.2),
+])
+def test_parse_weight_units(text, kg):
+    assert parse_weight(text) == kg
+
+@pytest.mark.parametrize("text", [
+    None, "", "3-4 kg", "1.2.3", "3 4", "7 lb 8", "7 lb 2 lb", "about 3 kg", "3 kg approx", "8 stone"
+])
+def test_parse_weight_refuses_to_guess(text):
+    assert parse_weight(text) is None
+
+def _snapshot(db):
+    # Projection rows without their surrogate ids, which a rebuild reassigns
+    def rows(model, *columns):
+        return sorted(tuple(getattr(r, c) for c in columns) for r in db.query(model))
+    db.expire_all()
+    return {
+        "dashboard": {
+            "babies": rows(Baby, "id", "household_id", "name", "gender", "birth_date", "weight", "photo_url", "created_at"),
+            "tasks": rows(Task, "id", "baby_id", "title", "is_completed", "completed_at", "due_time", "action_type", "interval_minutes"),
+            "sleeps": rows(SleepEvent, "id", "baby_id", "start_time", "end_time", "is_sleeping"),
+            "cries": rows(CryEvent, "id", "baby_id", "intensity", "timestamp", "audio_url"),
+            "recordings": rows(NightRecording, "id", "baby_id", "timestamp", "audio_url", "duration"),
+        },
+        "growth": rows(GrowthPoint, "event_id", "baby_id", "weight_kg", "measured_at"),
+        "task_history": rows(TaskHistory, "event_id", "task_id", "baby_id", "user_id", "action", "created_at"),
+    }
+
+@pytest.fixture
+def activity(login):
+    client = login()
+    baby_id = client.post("/api/register-baby", data={**BABY, "weight": "3.2 kg"}).json()["baby_id"]
+    client.post("/api/register-baby", data={**BABY, "weight": "3,400 g", "baby_id": baby_id})
+    task_id = client.post("/api/task/create", data={"title": "Feed", "baby_id": baby_id}).json()["task_id"]
+    client.post(f"/api/task/toggle/{task_id}")
+    client.post("/api/sleep/toggle", data={"baby_id": baby_id})
+    client.post("/api/sleep/toggle", data={"baby_id": baby_id})
+    client.post("/api/cry", data={"intensity": "High", "baby_id": baby_id})
+    # An unfinished night upload: its duration is progress, not yet logged
+    upload = client.post("/api/night-recording/start", data={"sample_rate": 8000, "baby_id": baby_id}).json()
+    assert client.put(f"/api/night-recording/{upload['upload_id']}", params={"offset": 0}, content=b"\0" * 32000).json()["duration"] == 2
+    return client, baby_id, task_id
+
+@pytest.mark.parametrize("name", sorted(PROJECTIONS_BY_NAME))
+def test_replaying_twice_reproduces_the_same_rows(activity, db, name):
+    before = _snapshot(db)
+    rebuild_projections(db, [name], batch_size=3)
+    once = _snapshot(db)
+    rebuild_projections(db, [name], batch_size=3)
+    assert _snapshot(db) == once == before
+
+def test_growth_points_only_on_weight_change(login):
+    client = login()
+    baby_id = client.post("/api/register-baby", data={**BABY, "weight": "3.2"}).json()["baby_id"]
+    for weight in ("3200 g", "3.5 kg", "3,5", "unknown", "3,500 g"):
+        client.post("/api/register-baby", data={**BABY, "weight": weight, "baby_id": baby_id})
+    points = client.get(f"/api/babies/{baby_id}/growth").json()["points"]
+    assert [p["weight_kg"] for p in points] == [3.2, 3.5]
+
+def test_task_toggles_record_history(activity):
+    client, baby_id, task_id = activity
+    client.post(f"/api/task/toggle/{task_id}")
+    client.post(f"/api/task/toggle/{task_id}")
+    history = client.get(f"/api/babies/{baby_id}/task-history", params={"task_id": task_id}).json()["history"]
+    assert [h["action"] for h in reversed(history)] == ["created", "completed", "reopened", "completed"]
+    assert all(h["task_id"] == task_id and h["user_id"] for h in history)
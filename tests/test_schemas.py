@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from backend.schemas import DashboardOut, HouseholdDashboardOut, TaskOut, parse_fields
+
+def dashboard() -> DashboardOut:
+    return DashboardOut(
+        cry_count_today=2,
+        tasks=[TaskOut(id=1, title="Feed", is_completed=True), TaskOut(id=2, title="Bath")],
+        recent_cries=[{"id": 1, "intensity": "High", "timestamp": datetime(2026, 1, 1)}]
+    )
+
+def test_no_fields_means_no_filter():
+    assert parse_fields(DashboardOut, None) is None
+    assert parse_fields(DashboardOut, "") is None
+
+def test_nested_list_path():
+    include = parse_fields(DashboardOut, "tasks.title,cry_count_today")
+    assert include == {"tasks": {"__all__": {"title": True}}, "cry_count_today": True}
+    assert dashboard().model_dump(include=include) == {"tasks": [{"title": "Feed"}, {"title": "Bath"}], "cry_count_today": 2}
+
+def test_whole_field_wins_over_subpath_in_either_order():
+    full = [t.model_dump() for t in dashboard().tasks]
+    for fields in ("tasks,tasks.title", "tasks.title,tasks"):
+        include = parse_fields(DashboardOut, fields)
+        assert include == {"tasks": True}
+        assert dashboard().model_dump(include=include) == {"tasks": full}
+
+def test_paths_through_nested_lists():
+    include = parse_fields(HouseholdDashboardOut, "name, babies.tasks.title,")
+    assert include == {"name": True, "babies": {"__all__": {"tasks": {"__all__": {"title": True}}}}}
+
+@pytest.mark.parametrize("fields", ["nope", "tasks.nope", "cry_count_today.value", "baby..name"])
+def test_unknown_fields_are_rejected(fields):
+    with pytest.raises(HTTPException) as exc:
+        parse_fields(DashboardOut, fields)
+    assert exc.value.status_code == 400